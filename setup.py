@@ -27,6 +27,9 @@ requirements = [
     'six>=1',
     'xmltodict>=0.9.2'
 ]
+extras_requirements = {
+    'orjson': ['orjson>=3'],
+}
 test_requirements = [
     'responses>=0.5',
     'mock>=1.3,<1.4'
@@ -65,6 +68,7 @@ setup(
     package_dir={'tapioca': 'tapioca'},
     include_package_data=True,
     install_requires=requirements,
+    extras_require=extras_requirements,
     license="MIT",
     zip_safe=False,
     keywords='tapioca,wrapper,api',
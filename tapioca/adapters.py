@@ -1,5 +1,10 @@
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .tapioca import TapiocaInstantiator
 from .exceptions import (
     AccessDenied,
@@ -17,6 +22,16 @@ def generate_wrapper_from_adapter(adapter_class):
     return TapiocaInstantiator(adapter_class)
 
 
+def _response_json(response):
+    # orjson only reads UTF-8 and stricter JSON, let requests handle the rest
+    if orjson is not None:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            pass
+    return response.json()
+
+
 class TapiocaAdapter(object):
     serializer_class = SimpleSerializer
 
@@ -141,13 +156,13 @@ class JSONAdapterMixin(object):
     def response_to_native(self, response):
         if response.content.strip():
             try:
-                return response.json()
+                return _response_json(response)
             except ValueError:
                 return response.content
 
     def get_error_message(self, data, response=None):
         if not data and response.content.strip():
-            data = json.loads(response.content.decode("utf-8"))
+            data = _response_json(response)
 
         if data:
             return data.get("error", None)
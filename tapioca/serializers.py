@@ -1,9 +1,39 @@
 
 import arrow
+import datetime
 from decimal import Decimal
+from functools import lru_cache
+
+
+@lru_cache(maxsize=4096)
+def _parse_datetime(value):
+    try:
+        parsed = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        return arrow.get(value).datetime
+    # arrow reads naive timestamps as UTC
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+
+@lru_cache(maxsize=4096)
+def _parse_decimal(value):
+    return Decimal(value)
+
+
+# how _serialize_nodes handles a value, by its serialize_<type> method
+_DICT_NODE, _LIST_NODE, _VALUE_NODE = range(3)
+_EXIT_NODE = object()
 
 
 class BaseSerializer(object):
+    _dispatch = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # each serializer class resolves its own serialize_<type> methods
+        cls._dispatch = {}
 
     def deserialize(self, method_name, value, **kwargs):
         if hasattr(self, method_name):
@@ -11,17 +41,78 @@ class BaseSerializer(object):
         raise NotImplementedError("Desserialization method not found")
 
     def serialize_dict(self, data):
-        return {key: self.serialize(value) for key, value in data.items()}
+        serialized = dict(data)
+        self._serialize_nodes(
+            [(serialized, key, value) for key, value in data.items()], id(data))
+        return serialized
 
     def serialize_list(self, data):
-        return [self.serialize(item) for item in data]
+        serialized = list(data)
+        self._serialize_nodes(
+            [(serialized, index, item) for index, item in enumerate(data)],
+            id(data))
+        return serialized
+
+    def _serialize_nodes(self, stack, root_id):
+        # walks nested dicts and lists with an explicit stack instead of recursion,
+        # writing each serialized value back into its (already copied) container.
+        # An exit marker is pushed below each container's children so `ancestors`
+        # only holds the containers on the current path.
+        ancestors = {root_id}
+        while stack:
+            container, key, value = stack.pop()
+            if container is _EXIT_NODE:
+                ancestors.discard(key)
+                continue
+
+            dispatch = self._get_dispatch(type(value))
+            if dispatch is None:
+                continue
+
+            serialize_method, node_kind = dispatch
+            if node_kind == _VALUE_NODE:
+                container[key] = getattr(self, serialize_method)(value)
+                continue
+
+            value_id = id(value)
+            if value_id in ancestors:
+                raise ValueError("Circular reference detected")
+            ancestors.add(value_id)
+            stack.append((_EXIT_NODE, value_id, None))
+
+            if node_kind == _DICT_NODE:
+                serialized = container[key] = dict(value)
+                stack.extend((serialized, k, v) for k, v in value.items())
+            else:
+                serialized = container[key] = list(value)
+                stack.extend((serialized, i, item) for i, item in enumerate(value))
+
+    def _get_serialize_method(self, data_type):
+        serialize_method = f'serialize_{data_type.__name__}'.lower()
+        if not hasattr(self, serialize_method):
+            return None
+
+        # the default container methods are walked inline by _serialize_nodes
+        class_method = getattr(self.__class__, serialize_method, None)
+        if class_method is BaseSerializer.serialize_dict:
+            return serialize_method, _DICT_NODE
+        if class_method is BaseSerializer.serialize_list:
+            return serialize_method, _LIST_NODE
+        return serialize_method, _VALUE_NODE
+
+    def _get_dispatch(self, data_type):
+        try:
+            return self._dispatch[data_type]
+        except KeyError:
+            dispatch = self._get_serialize_method(data_type)
+            self._dispatch[data_type] = dispatch
+            return dispatch
 
     def serialize(self, data):
-        data_type = type(data).__name__
+        dispatch = self._get_dispatch(type(data))
 
-        serialize_method = f'serialize_{data_type}'.lower()
-        if hasattr(self, serialize_method):
-            return getattr(self, serialize_method)(data)
+        if dispatch is not None:
+            return getattr(self, dispatch[0])(data)
 
         return data
 
@@ -29,13 +120,21 @@ class BaseSerializer(object):
 class SimpleSerializer(BaseSerializer):
 
     def to_datetime(self, value):
+        if isinstance(value, str):
+            return _parse_datetime(value)
         return arrow.get(value).datetime
 
     def to_decimal(self, value):
+        if isinstance(value, str):
+            return _parse_decimal(value)
         return Decimal(value)
 
     def serialize_decimal(self, data):
         return str(data)
 
     def serialize_datetime(self, data):
+        if isinstance(data, datetime.datetime):
+            if data.tzinfo is None:
+                data = data.replace(tzinfo=datetime.timezone.utc)
+            return data.isoformat()
         return arrow.get(data).isoformat()
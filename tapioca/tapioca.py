@@ -1,13 +1,19 @@
 from __future__ import unicode_literals
 
-import copy
 import json
 import time
 import logging
+import pprint
+import threading
 import webbrowser
-from collections import OrderedDict
+import weakref
+from collections.abc import Mapping, Sized
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from urllib.parse import urlparse
 
 import requests as requests
+import requests.adapters
 
 from .exceptions import ResponseProcessException
 
@@ -17,6 +23,146 @@ from typing import Type, Optional, Any
 
 logger = logging.getLogger(__name__)
 
+_PP = pprint.PrettyPrinter(indent=4)
+
+POOL_CONNECTIONS = 16
+POOL_MAXSIZE = 64
+
+_DEFAULT_ADAPTER = None
+_DEFAULT_ADAPTER_LOCK = threading.Lock()
+_POOLED_ADAPTERS = weakref.WeakSet()
+
+_PREFETCH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=2, thread_name_prefix="tapioca-prefetch"
+)
+
+RATE_LIMIT_THRESHOLD = 100
+
+# kinds of data a client can wrap, only lists and mappings are indexed into
+_LIST_DATA, _DICT_DATA, _OTHER_DATA = range(3)
+
+_RATE_LIMIT_BUCKETS = {}
+_RATE_LIMIT_LOCK = threading.Lock()
+
+
+class _RateLimitBucket(object):
+    """
+    Rate limit state shared by every client talking to the same host.
+    """
+
+    __slots__ = ("remaining", "reset_at", "next_at")
+
+    def __init__(self, remaining, reset_at, next_at):
+        self.remaining = remaining
+        self.reset_at = reset_at
+        self.next_at = next_at
+
+
+def _reserve_rate_limit_delay(host, remaining_requests, reset_time):
+    """
+    Record the rate limit headers of a response and reserve the next request slot.
+
+    Requests to a host are spread evenly over what is left of its rate limit window
+    once fewer than RATE_LIMIT_THRESHOLD requests remain.
+
+    :param host: Host the response came from.
+    :type host: str
+    :param remaining_requests: Value of the X-RateLimit-Remaining header.
+    :type remaining_requests: int
+    :param reset_time: Value of the X-RateLimit-Reset header, in seconds.
+    :type reset_time: int
+    :returns: Seconds to wait before the next request.
+    :rtype: float
+    """
+    now = time.monotonic()
+    reset_at = now + reset_time
+    with _RATE_LIMIT_LOCK:
+        bucket = _RATE_LIMIT_BUCKETS.get(host)
+        # headers only have second resolution, a later reset means a new window
+        if bucket is None or reset_at >= bucket.reset_at + 1:
+            bucket = _RateLimitBucket(remaining_requests, reset_at, now)
+            _RATE_LIMIT_BUCKETS[host] = bucket
+        else:
+            # concurrent responses may carry stale counters, keep the lowest
+            bucket.remaining = min(bucket.remaining, remaining_requests)
+            bucket.reset_at = reset_at
+
+        if bucket.remaining > RATE_LIMIT_THRESHOLD:
+            return 0
+
+        interval = (bucket.reset_at - now) / max(1, bucket.remaining)
+        bucket.next_at = max(now, bucket.next_at) + interval
+        bucket.remaining = max(0, bucket.remaining - 1)
+        return bucket.next_at - now
+
+
+def _build_pooled_adapter():
+    """
+    Build an HTTPAdapter that keeps a bounded keep-alive connection pool.
+
+    :returns: A new pooled adapter.
+    :rtype: requests.adapters.HTTPAdapter
+    """
+    adapter = requests.adapters.HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE
+    )
+    _POOLED_ADAPTERS.add(adapter)
+    return adapter
+
+
+def _build_pooled_session(adapter):
+    """
+    Build a requests.Session that sends HTTP(S) requests through a shared adapter.
+
+    Only the connection pool is shared, cookies, headers and auth stay per session.
+
+    :param adapter: The pooled adapter to mount.
+    :type adapter: requests.adapters.HTTPAdapter
+    :returns: A new session with the adapter mounted.
+    :rtype: requests.Session
+    """
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _get_default_adapter():
+    """
+    Get the process-wide pooled adapter used by clients built without a session.
+
+    :returns: The shared adapter, created on first use.
+    :rtype: requests.adapters.HTTPAdapter
+    """
+    global _DEFAULT_ADAPTER
+    if _DEFAULT_ADAPTER is None:
+        with _DEFAULT_ADAPTER_LOCK:
+            if _DEFAULT_ADAPTER is None:
+                _DEFAULT_ADAPTER = _build_pooled_adapter()
+    return _DEFAULT_ADAPTER
+
+
+@lru_cache(maxsize=256)
+def _join_resource_url(api_root, resource_path):
+    return api_root.rstrip("/") + "/" + resource_path.lstrip("/")
+
+
+@lru_cache(maxsize=256)
+def _to_camel_case(name):
+    """
+    Convert a snake_case string in camelCase and CamelCase.
+
+    :param name: String in snake_case.
+    :type name: str
+    :returns: The string converted to camelCase and to CamelCase.
+    :rtype: tuple
+    """
+    if isinstance(name, int):
+        return (name, name)
+    components = name.split("_")
+    camel_case_name = components[0] + "".join(x.title() for x in components[1:])
+    return (camel_case_name, camel_case_name[:1].upper() + camel_case_name[1:])
+
 
 class TapiocaInstantiator:
     """
@@ -31,6 +177,7 @@ class TapiocaInstantiator:
         :type adapter_class: Type
         """
         self.adapter_class = adapter_class
+        self._default_adapter = None
 
     def __call__(
         self,
@@ -43,13 +190,19 @@ class TapiocaInstantiator:
 
         :param serializer_class: The serializer class to be used by the adapter class. Defaults to None.
         :type serializer_class: Optional[Type]
-        :param session: The session to be used by the TapiocaClient. Defaults to None.
+        :param session: The session to be used by the TapiocaClient. Defaults to a new
+            session sharing the connection pool of every client created by this
+            instantiator.
         :type session: Optional[Any]
         :param kwargs: Additional parameters to be passed to the TapiocaClient.
         :return: A TapiocaClient instance configured with the provided parameters.
         :rtype: TapiocaClient
         """
         refresh_token_default = kwargs.pop("refresh_token_by_default", False)
+        if session is None:
+            if self._default_adapter is None:
+                self._default_adapter = _build_pooled_adapter()
+            session = _build_pooled_session(self._default_adapter)
         return TapiocaClient(
             self.adapter_class(serializer_class=serializer_class),
             api_params=kwargs,
@@ -57,8 +210,31 @@ class TapiocaInstantiator:
             session=session,
         )
 
+    def close(self):
+        """
+        Close the connection pool shared by clients created without an explicit session.
+
+        A new pool is built the next time a client is created.
+        """
+        if self._default_adapter is not None:
+            self._default_adapter.close()
+            self._default_adapter = None
+
 
 class TapiocaClient(object):
+    __slots__ = (
+        "_api",
+        "_data",
+        "_response",
+        "_api_params",
+        "_request_kwargs",
+        "_resource",
+        "_refresh_token_default",
+        "_refresh_data",
+        "_session",
+        "_data_kind",
+    )
+
     def __init__(
         self,
         api,
@@ -92,7 +268,8 @@ class TapiocaClient(object):
         :type refresh_token_by_default: bool, optional
         :param refresh_data: Data to be refreshed (default is None).
         :type refresh_data: Any, optional
-        :param session: Session to be used (default is a new requests.Session()).
+        :param session: Session to be used (default is a new session on the process-wide
+            connection pool).
         :type session: requests.Session, optional
         """
         self._api = api
@@ -103,19 +280,35 @@ class TapiocaClient(object):
         self._resource = resource
         self._refresh_token_default = refresh_token_by_default
         self._refresh_data = refresh_data
-        self._session = session or requests.Session()
+        self._session = session or _build_pooled_session(_get_default_adapter())
+        if isinstance(data, list):
+            self._data_kind = _LIST_DATA
+        elif isinstance(data, Mapping):
+            self._data_kind = _DICT_DATA
+        else:
+            self._data_kind = _OTHER_DATA
 
-    def _instatiate_api(self):
+    def close(self):
         """
-        Instantiate the API.
+        Close the session, releasing the connections kept in its own adapters.
 
-        :returns: Instance of the API.
-        :rtype: Any
+        The connection pool shared with other clients is left open, it is closed by
+        TapiocaInstantiator.close(). Clients returned by attribute access, calls and
+        requests share the session of the client they were created from, so this
+        should only be called on the root client.
         """
-        serializer_class = None
-        if self._api.serializer:
-            serializer_class = self._api.serializer.__class__
-        return self._api.__class__(serializer_class=serializer_class)
+        if self._session is None:
+            return
+        # same as Session.close(), minus the adapters other clients rely on
+        for adapter in self._session.adapters.values():
+            if adapter not in _POOLED_ADAPTERS:
+                adapter.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
 
     def _wrap_in_tapioca(self, data, *args, **kwargs):
         """
@@ -128,7 +321,7 @@ class TapiocaClient(object):
         """
         request_kwargs = kwargs.pop("request_kwargs", self._request_kwargs)
         return TapiocaClient(
-            self._instatiate_api(),
+            self._api,
             data=data,
             api_params=self._api_params,
             request_kwargs=request_kwargs,
@@ -152,7 +345,7 @@ class TapiocaClient(object):
         """
         request_kwargs = kwargs.pop("request_kwargs", self._request_kwargs)
         return TapiocaClientExecutor(
-            self._instatiate_api(),
+            self._api,
             data=data,
             api_params=self._api_params,
             request_kwargs=request_kwargs,
@@ -170,14 +363,15 @@ class TapiocaClient(object):
         :returns: The documentation string.
         :rtype: str
         """
-        resources = copy.copy(self._resource)
+        resources = self._resource or {}
         docs = (
             "Automatic generated __doc__ from resource_mapping.\n"
             "Resource: %s\n"
-            "Docs: %s\n" % (resources.pop("resource", ""), resources.pop("docs", ""))
+            "Docs: %s\n" % (resources.get("resource", ""), resources.get("docs", ""))
         )
         for key, value in sorted(resources.items()):
-            docs += "%s: %s\n" % (key.title(), value)
+            if key not in ("resource", "docs"):
+                docs += "%s: %s\n" % (key.title(), value)
         docs = docs.strip()
         return docs
 
@@ -203,20 +397,6 @@ class TapiocaClient(object):
             data, resource=self._resource, response=self._response
         )
 
-    def _to_camel_case(self, name):
-        """
-        Convert a snake_case string in CamelCase.
-
-        :param name: String in snake_case.
-        :type name: str
-        :returns: The string converted to CamelCase.
-        :rtype: str
-        """
-        if isinstance(name, int):
-            return name
-        components = name.split("_")
-        return components[0] + "".join(x.title() for x in components[1:])
-
     def _get_client_from_name(self, name):
         """
         Get a client with the specified name.
@@ -226,10 +406,11 @@ class TapiocaClient(object):
         :returns: Client if it exists, None otherwise.
         :rtype: TapiocaClient or None
         """
+        data_kind = self._data_kind
         if (
-            isinstance(self._data, list)
+            data_kind == _LIST_DATA
             and isinstance(name, int)
-            or callable(getattr(self._data, "__iter__", None))
+            or data_kind == _DICT_DATA
             and name in self._data
         ):
             return self._wrap_in_tapioca(data=self._data[name])
@@ -240,7 +421,7 @@ class TapiocaClient(object):
             resource = resource_mapping[name]
             api_root = self._api.get_api_root(self._api_params, resource_name=name)
 
-            url = api_root.rstrip("/") + "/" + resource["resource"].lstrip("/")
+            url = _join_resource_url(api_root, resource["resource"])
             return self._wrap_in_tapioca(
                 url, resource=resource
             )  # Pass the resource parameter here
@@ -256,23 +437,21 @@ class TapiocaClient(object):
         :returns: Client if it exists, None otherwise.
         :rtype: TapiocaClient or None
         """
-        client = self._get_client_from_name(name)
-        if client is not None:
-            return client
-
-        camel_case_name = self._to_camel_case(name)
-        client = self._get_client_from_name(camel_case_name)
-        if client is not None:
-            return client
-
-        normal_camel_case_name = camel_case_name[0].upper()
-        normal_camel_case_name += camel_case_name[1:]
+        variants = [name]
+        if isinstance(name, str):
+            for variant in _to_camel_case(name):
+                if variant not in variants:
+                    variants.append(variant)
 
-        client = self._get_client_from_name(normal_camel_case_name)
-        return client if client is not None else None
+        for variant in variants:
+            client = self._get_client_from_name(variant)
+            if client is not None:
+                return client
+        return None
 
     def __getattr__(self, name):
-        if name in ["_data", "__setstate__"]:
+        # unset slots (e.g. while unpickling) must not fall back to resource lookup
+        if name in TapiocaClient.__slots__ or name == "__setstate__":
             raise AttributeError(
                 f"'{type(self).__name__}' object has no attribute '{name}'"
             )
@@ -294,14 +473,17 @@ class TapiocaClient(object):
         return self._data.keys() if isinstance(self._data, dict) else []
 
     def __str__(self):
-        if type(self._data) == OrderedDict:
-            return "<{} object, printing as dict:\n" "{}>".format(
-                self.__class__.__name__, json.dumps(self._data, indent=4)
-            )
-        import pprint
-
-        pp = pprint.PrettyPrinter(indent=4)
-        return f"<{self.__class__.__name__} object\n{pp.pformat(self._data)}>"
+        if isinstance(self._data, dict):
+            try:
+                return "<{} object, printing as dict:\n" "{}>".format(
+                    self.__class__.__name__,
+                    json.dumps(self._data, indent=4, default=str),
+                )
+            except (TypeError, ValueError):
+                # keys json cannot encode or circular data, fall back to pprint
+                pass
+
+        return f"<{self.__class__.__name__} object\n{_PP.pformat(self._data)}>"
 
     def _repr_pretty_(self, p, cycle):
         p.text(self.__str__())
@@ -318,6 +500,8 @@ class TapiocaClientExecutor(TapiocaClient):
     Subclass of `TapiocaClient` with additional methods for executing requests and handling responses.
     """
 
+    __slots__ = ()
+
     def __init__(self, api, *args, **kwargs):
         """
         Initialize a TapiocaClientExecutor instance.
@@ -356,6 +540,10 @@ class TapiocaClientExecutor(TapiocaClient):
         :returns: Method or wrapped executor, depending on the attribute.
         :rtype: Any
         """
+        if name in TapiocaClient.__slots__ or name == "__setstate__":
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
         if name.startswith("to_"):
             return self._api._get_to_native_method(name, self._data)
         return self._wrap_in_tapioca_executor(getattr(self._data, name))
@@ -420,9 +608,13 @@ class TapiocaClientExecutor(TapiocaClient):
         :type request_method: str
         :param refresh_token: Flag indicating whether the token should be refreshed.
         :type refresh_token: bool, optional
+        :param keepalive: When False, send the request with ``Connection: close`` so its
+            connection is not kept in the pool afterwards (default is True).
+        :type keepalive: bool, optional
         :returns: Response from the API call.
         :rtype: Any
         """
+        keepalive = kwargs.pop("keepalive", True)
         if "url" not in kwargs:
             kwargs["url"] = self._data
 
@@ -430,20 +622,28 @@ class TapiocaClientExecutor(TapiocaClient):
             self._api_params, request_method, *args, **kwargs
         )
 
+        if not keepalive:
+            request_kwargs["headers"] = dict(
+                request_kwargs.get("headers") or {}, Connection="close"
+            )
         response = self._session.request(request_method, **request_kwargs)
         try:
 
-            # Extract rate limit headers
-            remaining_requests = int(response.headers.get("X-RateLimit-Remaining", 1))
-            reset_time = int(response.headers.get("X-RateLimit-Reset", 0))
-
-            # Set a threshold for remaining requests
-            threshold = 100
-
-            # Calculate delay based on remaining requests and reset time
-            if remaining_requests <= threshold and reset_time > 0:
-                delay = reset_time / max(1, remaining_requests)
-                time.sleep(delay)
+            # Extract rate limit headers, responses without a reset are not throttled
+            headers = response.headers
+            reset_header = headers.get("X-RateLimit-Reset")
+            reset_time = int(reset_header) if reset_header is not None else 0
+
+            # Throttle against the rate limit shared by every client of this host
+            if reset_time > 0:
+                remaining_requests = int(headers.get("X-RateLimit-Remaining", 1))
+                delay = _reserve_rate_limit_delay(
+                    urlparse(response.url or request_kwargs["url"]).netloc,
+                    remaining_requests,
+                    reset_time,
+                )
+                if delay > 0:
+                    time.sleep(delay)
 
             data = self._api.process_response(response)
 
@@ -471,7 +671,11 @@ class TapiocaClientExecutor(TapiocaClient):
                 if self._refresh_data:
                     propagate_exception = False
                     return self._make_request(
-                        request_method, refresh_token=False, *args, **kwargs
+                        request_method,
+                        refresh_token=False,
+                        keepalive=keepalive,
+                        *args,
+                        **kwargs,
                     )
 
             if propagate_exception:
@@ -563,7 +767,7 @@ class TapiocaClientExecutor(TapiocaClient):
         reached_item_limit = max_items is not None and max_items <= item_count
         return reached_page_limit or reached_item_limit
 
-    def pages(self, max_pages=None, max_items=None, **kwargs):
+    def pages(self, max_pages=None, max_items=None, prefetch=True, **kwargs):
         """
         Get the pages.
 
@@ -571,37 +775,79 @@ class TapiocaClientExecutor(TapiocaClient):
         :type max_pages: int, optional
         :param max_items: Maximum number of items.
         :type max_items: int, optional
+        :param prefetch: Whether to request the next page in the background while the
+            current one is being consumed (default is True). Clients that refresh
+            their token by default never prefetch, since a refresh updates the
+            client's state from the background thread. A prefetch already sent when
+            the iteration stops early cannot be recalled.
+        :type prefetch: bool, optional
         :returns: Pages.
         :rtype: Any
         """
+        prefetch = prefetch and not self._refresh_token_default
         executor = self
         iterator_list = executor._get_iterator_list()
 
         page_count = 0
         item_count = 0
+        next_page = None
 
-
-        while iterator_list and not self._reached_max_limits(
-            page_count, item_count, max_pages, max_items
-        ):
-            for item in iterator_list:
-                if self._reached_max_limits(
-                    page_count, item_count, max_pages, max_items
+        try:
+            while iterator_list and not self._reached_max_limits(
+                page_count, item_count, max_pages, max_items
+            ):
+                next_page = None
+                page_size = (
+                    len(iterator_list) if isinstance(iterator_list, Sized) else None
+                )
+                # an unsized page can't tell whether it exhausts max_items
+                if (
+                    prefetch
+                    and (page_size is not None or max_items is None)
+                    and not self._reached_max_limits(
+                        page_count + 1,
+                        item_count + (page_size or 0),
+                        max_pages,
+                        max_items,
+                    )
                 ):
-                    break
-                yield self._wrap_in_tapioca(item)
-                item_count += 1
-
-            page_count += 1
-
-            next_request_kwargs = executor._get_iterator_next_request_kwargs()
-
-            if not next_request_kwargs:
-                break
-
-            response = self.get(**next_request_kwargs)
-            executor = response()
-            iterator_list = executor._get_iterator_list()
+                    next_request_kwargs = executor._get_iterator_next_request_kwargs()
+                    if next_request_kwargs:
+                        next_page = _PREFETCH_EXECUTOR.submit(
+                            self.get, **next_request_kwargs
+                        )
+
+                for item in iterator_list:
+                    if self._reached_max_limits(
+                        page_count, item_count, max_pages, max_items
+                    ):
+                        break
+                    yield self._wrap_in_tapioca(item)
+                    item_count += 1
+
+                page_count += 1
+
+                if next_page is not None:
+                    response = next_page.result()
+                else:
+                    if self._reached_max_limits(
+                        page_count, item_count, max_pages, max_items
+                    ):
+                        break
+
+                    next_request_kwargs = executor._get_iterator_next_request_kwargs()
+
+                    if not next_request_kwargs:
+                        break
+
+                    response = self.get(**next_request_kwargs)
+
+                executor = response()
+                iterator_list = executor._get_iterator_list()
+        finally:
+            # drop the prefetch if the consumer stopped before it was needed
+            if next_page is not None:
+                next_page.cancel()
 
     def open_docs(self):
         if not self._resource:
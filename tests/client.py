@@ -58,6 +58,15 @@ class TesterClientAdapter(JSONAdapterMixin, TapiocaAdapter):
 TesterClient = generate_wrapper_from_adapter(TesterClientAdapter)
 
 
+class GeneratorIteratorClientAdapter(TesterClientAdapter):
+
+    def get_iterator_list(self, response_data):
+        return (item for item in response_data['data'])
+
+
+GeneratorIteratorClient = generate_wrapper_from_adapter(GeneratorIteratorClientAdapter)
+
+
 class CustomSerializer(SimpleSerializer):
 
     def to_kwargs(self, data, **kwargs):
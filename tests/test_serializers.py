@@ -3,6 +3,7 @@
 from __future__ import unicode_literals
 
 import arrow
+import datetime
 import unittest
 import responses
 import json
@@ -145,6 +146,28 @@ class TestDeserialization(unittest.TestCase):
             response.decimal_value().to_kwargs(some_key='some value'),
             {'some_key': 'some value'})
 
+    def test_to_datetime_parses_repeated_strings_once(self):
+        serializer = SimpleSerializer()
+        string_date = '2014-11-13T14:53:18.694072+00:00'
+
+        first = serializer.to_datetime(string_date)
+        second = SimpleSerializer().to_datetime(string_date)
+
+        self.assertIs(first, second)
+        self.assertEqual(first, arrow.get(string_date).datetime)
+
+    def test_to_datetime_reads_naive_strings_as_utc(self):
+        date = SimpleSerializer().to_datetime('2014-11-13T14:53:18')
+
+        self.assertEqual(date, arrow.get('2014-11-13T14:53:18').datetime)
+        self.assertEqual(date.utcoffset(), datetime.timedelta(0))
+
+    def test_to_decimal_accepts_non_string_values(self):
+        serializer = SimpleSerializer()
+
+        self.assertEqual(serializer.to_decimal(10), Decimal('10'))
+        self.assertEqual(serializer.to_decimal('10.51'), Decimal('10.51'))
+
 
 class TestSerialization(unittest.TestCase):
 
@@ -236,3 +259,82 @@ class TestSerialization(unittest.TestCase):
         serialized = self.serializer.serialize(data)
 
         self.assertEqual(serialized, [string_date])
+
+    def test_custom_type_serialization(self):
+        class Point(object):
+            def __init__(self, x, y):
+                self.x = x
+                self.y = y
+
+        class PointSerializer(SimpleSerializer):
+            def serialize_point(self, data):
+                return [data.x, data.y]
+
+        point = Point(1, 2)
+
+        self.assertEqual(PointSerializer().serialize({'point': point}), {'point': [1, 2]})
+        self.assertIs(self.serializer.serialize(point), point)
+
+    def test_naive_datetime_serialization_is_utc(self):
+        data = datetime.datetime(2014, 11, 13, 14, 53, 18)
+
+        serialized = self.serializer.serialize(data)
+
+        self.assertEqual(serialized, '2014-11-13T14:53:18+00:00')
+
+    def test_static_and_class_serialize_methods(self):
+        class ConstantSerializer(SimpleSerializer):
+            @staticmethod
+            def serialize_int(data):
+                return str(data)
+
+            @classmethod
+            def serialize_float(cls, data):
+                return cls.__name__
+
+        serialized = ConstantSerializer().serialize({'int': 1, 'float': [1.5]})
+
+        self.assertEqual(serialized, {'int': '1', 'float': ['ConstantSerializer']})
+
+    def test_deeply_nested_serialization(self):
+        data = leaf = []
+        for _ in range(5000):
+            leaf.append({'decimal': Decimal('1.5'), 'children': []})
+            leaf = leaf[0]['children']
+
+        serialized = self.serializer.serialize(data)
+
+        for _ in range(5000):
+            self.assertEqual(serialized[0]['decimal'], '1.5')
+            serialized = serialized[0]['children']
+        self.assertEqual(serialized, [])
+
+    def test_circular_reference_serialization_raises_value_error(self):
+        data = {'list': []}
+        data['list'].append(data)
+
+        with self.assertRaises(ValueError):
+            self.serializer.serialize(data)
+
+        data = []
+        data.append(data)
+
+        with self.assertRaises(ValueError):
+            self.serializer.serialize(data)
+
+    def test_shared_reference_serialization(self):
+        shared = [Decimal('1.0')]
+
+        serialized = self.serializer.serialize({'a': shared, 'b': [shared]})
+
+        self.assertEqual(serialized, {'a': ['1.0'], 'b': [['1.0']]})
+
+    def test_overridden_serialize_dict_is_used_for_nested_dicts(self):
+        class UpperKeySerializer(SimpleSerializer):
+            def serialize_dict(self, data):
+                serialized = super().serialize_dict(data)
+                return {key.upper(): value for key, value in serialized.items()}
+
+        serialized = UpperKeySerializer().serialize([{'key': {'nested': Decimal('1.0')}}])
+
+        self.assertEqual(serialized, [{'KEY': {'NESTED': '1.0'}}])
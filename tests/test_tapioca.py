@@ -3,14 +3,19 @@
 from __future__ import unicode_literals
 
 import unittest
+import mock
+import requests
 import responses
 import json
+import math
 import pickle
 
+from tapioca import tapioca
 from tapioca.tapioca import TapiocaClient
 from tapioca.exceptions import ServerError, BadRequest, InvalidCredentials
 
-from tests.client import TesterClient, TokenRefreshClient, FailTokenRefreshClient
+from tests.client import (
+    TesterClient, TokenRefreshClient, FailTokenRefreshClient, GeneratorIteratorClient)
 
 
 class TestTapiocaClient(unittest.TestCase):
@@ -32,6 +37,9 @@ class TestTapiocaClient(unittest.TestCase):
 
         self.assertEqual(resource.data, expected_url)
 
+    def test_chained_clients_share_adapter(self):
+        self.assertIs(self.wrapper.user(id=1)._api, self.wrapper._api)
+
     def test_calling_len_on_tapioca_list(self):
         client = self.wrapper._wrap_in_tapioca([0, 1, 2])
         self.assertEqual(len(client), 3)
@@ -76,6 +84,39 @@ class TestTapiocaClient(unittest.TestCase):
         self.assertEqual(response.data.camel_case().data, 'data in camel case')
         self.assertEqual(response.data.normal_camel_case().data, 'data in camel case')
 
+    def test_name_variants_are_tried_once_each(self):
+        client = self.wrapper._wrap_in_tapioca({'Key': 'value'})
+
+        with mock.patch.object(TapiocaClient, '_get_client_from_name', autospec=True,
+                               side_effect=TapiocaClient._get_client_from_name) as get_client:
+            self.assertEqual(client.key().data, 'value')
+
+        self.assertEqual([c[0][1] for c in get_client.call_args_list], ['key', 'Key'])
+
+    def test_url_data_is_not_indexed(self):
+        resource = self.wrapper.test
+
+        self.assertEqual(resource['another_root']().data, 'https://api.another.com/another-root/')
+        with self.assertRaises(KeyError):
+            resource['example']
+
+    def test_to_camel_case(self):
+        self.assertEqual(tapioca._to_camel_case('key_snake_case'),
+                         ('keySnakeCase', 'KeySnakeCase'))
+        self.assertEqual(tapioca._to_camel_case(3), (3, 3))
+
+    def test_non_dict_mapping_data_is_indexed(self):
+        client = self.wrapper._wrap_in_tapioca(
+            requests.structures.CaseInsensitiveDict({'Content-Type': 'application/json'}))
+
+        self.assertEqual(client['content-type']().data, 'application/json')
+
+    def test_missing_int_key_on_dict_raises_key_error(self):
+        client = self.wrapper._wrap_in_tapioca({'key': 'value'})
+
+        with self.assertRaises(KeyError):
+            client[3]
+
     @responses.activate
     def test_should_be_able_to_access_by_index(self):
         responses.add(responses.GET, self.wrapper.test().data,
@@ -117,6 +158,71 @@ class TestTapiocaClient(unittest.TestCase):
         wrapper = TesterClient(default_url_params={'id': 123})
         self.assertEqual(wrapper.user().data, 'https://api.example.org/user/123/')
 
+    def test_clients_share_default_connection_pool(self):
+        wrapper = TesterClient()
+
+        self.assertIsNot(wrapper._session, self.wrapper._session)
+        self.assertIs(wrapper.test()._session, wrapper._session)
+        self.assertIs(wrapper._session.get_adapter('https://api.example.org'),
+                      self.wrapper._session.get_adapter('https://api.example.org'))
+
+    @responses.activate
+    def test_clients_do_not_share_cookies(self):
+        responses.add(responses.GET, self.wrapper.test().data,
+                      body='{}',
+                      status=200,
+                      headers={'Set-Cookie': 'sid=alice'},
+                      content_type='application/json')
+        other = TesterClient()
+
+        self.wrapper.test().get()
+        other.test().get()
+
+        self.assertNotIn('Cookie', responses.calls[1].request.headers)
+
+    def test_explicit_session_is_kept(self):
+        session = requests.Session()
+        wrapper = TesterClient(session=session)
+
+        self.assertIs(wrapper.test()._session, session)
+
+    def test_close_closes_session(self):
+        session = requests.Session()
+        adapter = mock.Mock()
+        session.mount('https://', adapter)
+        wrapper = TesterClient(session=session)
+
+        wrapper.close()
+
+        adapter.close.assert_called_once_with()
+
+    def test_context_manager_closes_session(self):
+        session = requests.Session()
+        adapter = mock.Mock()
+        session.mount('https://', adapter)
+
+        with TesterClient(session=session) as wrapper:
+            self.assertIsInstance(wrapper, TapiocaClient)
+
+        adapter.close.assert_called_once_with()
+
+    def test_close_keeps_shared_connection_pool_open(self):
+        adapter = self.wrapper._session.get_adapter('https://api.example.org')
+
+        with mock.patch.object(adapter, 'close') as close:
+            with TesterClient():
+                pass
+
+        self.assertFalse(close.called)
+
+    def test_instantiator_close_resets_default_connection_pool(self):
+        adapter = self.wrapper._session.get_adapter('https://api.example.org')
+
+        TesterClient.close()
+
+        self.assertIsNot(
+            TesterClient()._session.get_adapter('https://api.example.org'), adapter)
+
     @responses.activate
     def test_is_pickleable(self):
         wrapper = TesterClient()
@@ -144,6 +250,44 @@ class TestTapiocaClient(unittest.TestCase):
 
         self.assertEqual(iterations_count, 2)
 
+    def test_str_reflects_data_changes(self):
+        client = self.wrapper._wrap_in_tapioca({'key': 'value'})
+
+        self.assertIn('"key": "value"', str(client))
+
+        client._data['key'] = 'other'
+
+        self.assertIn('"key": "other"', str(client))
+
+    def test_str_of_dict_with_non_json_values(self):
+        client = self.wrapper._wrap_in_tapioca({'key': {1, 2}, (1, 2): 'value'})
+
+        self.assertIn("(1, 2): 'value'", str(client))
+
+        client = self.wrapper._wrap_in_tapioca({'key': {1}})
+
+        self.assertIn('"key": "{1}"', str(client))
+
+        data = {}
+        data['self'] = data
+        client = self.wrapper._wrap_in_tapioca(data)
+
+        self.assertIn("<Recursion on dict", str(client))
+
+    def test_str_of_list(self):
+        client = self.wrapper._wrap_in_tapioca(['value'])
+
+        self.assertEqual(str(client), "<TapiocaClient object\n['value']>")
+
+    def test_clients_have_no_instance_dict(self):
+        self.assertFalse(hasattr(self.wrapper, '__dict__'))
+        self.assertFalse(hasattr(self.wrapper.test(), '__dict__'))
+
+    def test_executor_is_pickleable(self):
+        executor = pickle.loads(pickle.dumps(self.wrapper.test()))
+
+        self.assertEqual(executor.data, 'https://api.example.org/test/')
+
 
 class TestTapiocaExecutor(unittest.TestCase):
 
@@ -164,6 +308,19 @@ class TestTapiocaExecutor(unittest.TestCase):
             'Foo: ' + self.wrapper.resource._resource['foo'] + '\n'
             'Spam: ' + self.wrapper.resource._resource['spam'])
 
+    def test_docs_do_not_change_resource(self):
+        resource = self.wrapper.resource
+
+        resource.__doc__
+
+        self.assertIn('resource', resource._resource)
+        self.assertIn('docs', resource._resource)
+
+    def test_docs_without_resource(self):
+        self.assertEqual(
+            self.wrapper._wrap_in_tapioca([0, 1, 2]).__doc__.split('\n')[1:],
+            ['Resource: ', 'Docs:'])
+
     def test_access_data_attributres_through_executor(self):
         client = self.wrapper._wrap_in_tapioca({'test': 'value'})
 
@@ -267,6 +424,29 @@ class TestTapiocaExecutorRequests(unittest.TestCase):
 
         self.assertEqual(response().data, {'data': {'key': 'value'}})
 
+    @responses.activate
+    def test_get_request_without_orjson(self):
+        responses.add(responses.GET, self.wrapper.test().data,
+                      body='{"data": {"key": "value"}}',
+                      status=200,
+                      content_type='application/json')
+
+        with mock.patch('tapioca.adapters.orjson', None):
+            response = self.wrapper.test().get()
+
+        self.assertEqual(response().data, {'data': {'key': 'value'}})
+
+    @responses.activate
+    def test_get_request_with_json_orjson_rejects(self):
+        responses.add(responses.GET, self.wrapper.test().data,
+                      body='{"data": NaN}',
+                      status=200,
+                      content_type='application/json')
+
+        response = self.wrapper.test().get()
+
+        self.assertTrue(math.isnan(response.data().data))
+
     @responses.activate
     def test_access_response_field(self):
         responses.add(responses.GET, self.wrapper.test().data,
@@ -324,6 +504,25 @@ class TestTapiocaExecutorRequests(unittest.TestCase):
 
         self.assertEqual(response().data, {'data': {'key': 'value'}})
 
+    @responses.activate
+    def test_request_without_keepalive_closes_connection(self):
+        responses.add(responses.GET, self.wrapper.test().data,
+                      body='{"data": {"key": "value"}}',
+                      status=200,
+                      content_type='application/json')
+
+        session = requests.Session()
+        session.auth = ('user', 'pass')
+        session.headers['X-Key'] = 'key'
+        wrapper = TesterClient(session=session)
+        response = wrapper.test().get(keepalive=False)
+
+        request_headers = responses.calls[0].request.headers
+        self.assertEqual(response().data, {'data': {'key': 'value'}})
+        self.assertEqual(request_headers['Connection'], 'close')
+        self.assertEqual(request_headers['X-Key'], 'key')
+        self.assertIn('Authorization', request_headers)
+
     @responses.activate
     def test_carries_request_kwargs_over_calls(self):
         responses.add(responses.GET, self.wrapper.test().data,
@@ -359,6 +558,60 @@ class TestTapiocaExecutorRequests(unittest.TestCase):
             self.wrapper.test().get()
         self.assertIn("server error test", server_exception.exception.args)
 
+    @responses.activate
+    def test_sleeps_when_close_to_rate_limit(self):
+        self.addCleanup(tapioca._RATE_LIMIT_BUCKETS.clear)
+        responses.add(responses.GET, self.wrapper.test().data,
+                      body='{"data": {"key": "value"}}',
+                      status=200,
+                      headers={'X-RateLimit-Remaining': '10', 'X-RateLimit-Reset': '5'},
+                      content_type='application/json')
+
+        with mock.patch('tapioca.tapioca.time.sleep') as sleep:
+            self.wrapper.test().get()
+
+        delay, = sleep.call_args[0]
+        self.assertAlmostEqual(delay, 0.5, places=2)
+
+    @responses.activate
+    def test_does_not_sleep_far_from_rate_limit(self):
+        self.addCleanup(tapioca._RATE_LIMIT_BUCKETS.clear)
+        responses.add(responses.GET, self.wrapper.test().data,
+                      body='{"data": {"key": "value"}}',
+                      status=200,
+                      headers={'X-RateLimit-Remaining': '1000', 'X-RateLimit-Reset': '5'},
+                      content_type='application/json')
+
+        with mock.patch('tapioca.tapioca.time.sleep') as sleep:
+            self.wrapper.test().get()
+
+        self.assertFalse(sleep.called)
+
+    @responses.activate
+    def test_does_not_sleep_without_rate_limit_reset(self):
+        responses.add(responses.GET, self.wrapper.test().data,
+                      body='{"data": {"key": "value"}}',
+                      status=200,
+                      headers={'X-RateLimit-Remaining': '1'},
+                      content_type='application/json')
+
+        with mock.patch('tapioca.tapioca.time.sleep') as sleep:
+            self.wrapper.test().get()
+
+        self.assertFalse(sleep.called)
+
+    def test_rate_limit_slots_are_shared_per_host(self):
+        self.addCleanup(tapioca._RATE_LIMIT_BUCKETS.clear)
+
+        first = tapioca._reserve_rate_limit_delay('api.example.org', 10, 5)
+        # a concurrent response with a stale counter must not reset the pacing
+        second = tapioca._reserve_rate_limit_delay('api.example.org', 12, 5)
+        other_host = tapioca._reserve_rate_limit_delay('api.another.com', 10, 5)
+
+        self.assertAlmostEqual(first, 0.5, places=2)
+        self.assertAlmostEqual(second, 0.5 + 5 / 9, places=2)
+        self.assertAlmostEqual(other_host, 0.5, places=2)
+
 
 class TestIteratorFeatures(unittest.TestCase):
 
@@ -489,6 +742,115 @@ class TestIteratorFeatures(unittest.TestCase):
 
         self.assertEqual(iterations_count, 0)
 
+    @responses.activate
+    def test_simple_pages_without_prefetch_iterator(self):
+        next_url = 'http://api.example.org/next_batch'
+
+        responses.add(responses.GET, self.wrapper.test().data,
+                      body='{"data": [{"key": "value"}], "paging": {"next": "%s"}}' % next_url,
+                      status=200,
+                      content_type='application/json')
+
+        responses.add(responses.GET, next_url,
+                      body='{"data": [{"key": "value"}], "paging": {"next": ""}}',
+                      status=200,
+                      content_type='application/json')
+
+        response = self.wrapper.test().get()
+
+        iterations_count = 0
+        for item in response().pages(prefetch=False):
+            self.assertIn(item.key().data, 'value')
+            iterations_count += 1
+
+        self.assertEqual(iterations_count, 2)
+
+    @responses.activate
+    def test_pages_with_generator_iterator_list(self):
+        wrapper = GeneratorIteratorClient()
+        next_url = 'http://api.example.org/next_batch'
+
+        responses.add(responses.GET, wrapper.test().data,
+                      body='{"data": [{"key": "value"}], "paging": {"next": "%s"}}' % next_url,
+                      status=200,
+                      content_type='application/json')
+
+        responses.add(responses.GET, next_url,
+                      body='{"data": [{"key": "value"}, {"key": "value"}], "paging": {"next": ""}}',
+                      status=200,
+                      content_type='application/json')
+
+        response = wrapper.test().get()
+
+        self.assertEqual(len(list(response().pages())), 3)
+        self.assertEqual(len(list(response().pages(max_items=1))), 1)
+        self.assertEqual(len(responses.calls), 2)
+
+    @responses.activate
+    def test_pages_cancels_prefetch_when_closed_early(self):
+        next_url = 'http://api.example.org/next_batch'
+
+        responses.add(responses.GET, self.wrapper.test().data,
+                      body='{"data": [{"key": "value"}, {"key": "value"}], "paging": {"next": "%s"}}' % next_url,
+                      status=200,
+                      content_type='application/json')
+
+        response = self.wrapper.test().get()
+
+        with mock.patch.object(tapioca._PREFETCH_EXECUTOR, 'submit') as submit:
+            iterator = response().pages()
+            next(iterator)
+            iterator.close()
+
+        submit.return_value.cancel.assert_called_once_with()
+        self.assertFalse(submit.return_value.result.called)
+
+    @responses.activate
+    def test_pages_does_not_prefetch_when_refreshing_token(self):
+        wrapper = TokenRefreshClient(token='token', refresh_token_by_default=True)
+        next_url = 'http://api.example.org/next_batch'
+
+        responses.add(responses.GET, wrapper.test().data,
+                      body='{"data": [{"key": "value"}], "paging": {"next": "%s"}}' % next_url,
+                      status=200,
+                      content_type='application/json')
+
+        responses.add(responses.GET, next_url,
+                      body='{"data": [{"key": "value"}], "paging": {"next": ""}}',
+                      status=200,
+                      content_type='application/json')
+
+        response = wrapper.test().get()
+
+        with mock.patch.object(tapioca._PREFETCH_EXECUTOR, 'submit') as submit:
+            iterations_count = len(list(response().pages()))
+
+        self.assertEqual(iterations_count, 2)
+        self.assertFalse(submit.called)
+
+    @responses.activate
+    def test_pages_does_not_request_pages_past_max_pages(self):
+        next_url = 'http://api.example.org/next_batch'
+
+        responses.add(responses.GET, self.wrapper.test().data,
+                      body='{"data": [{"key": "value"}], "paging": {"next": "%s"}}' % next_url,
+                      status=200,
+                      content_type='application/json')
+
+        responses.add(responses.GET, next_url,
+                      body='{"data": [{"key": "value"}], "paging": {"next": "%s"}}' % next_url,
+                      status=200,
+                      content_type='application/json')
+
+        response = self.wrapper.test().get()
+
+        iterations_count = 0
+        for item in response().pages(max_pages=2):
+            iterations_count += 1
+
+        self.assertEqual(iterations_count, 2)
+        self.assertEqual(len(responses.calls), 2)
+
 
 class TestTokenRefreshing(unittest.TestCase):
 